@@ -1,12 +1,14 @@
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, List, Tuple
 
 import pytest
 
-from goth.configuration import Override
+from goth.configuration import Configuration, Override, load_yaml
 from goth.runner.log import configure_logging
 
+ConfigLoader = Callable[[Path, List[Override]], Configuration]
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -46,6 +48,25 @@ def log_dir() -> Path:
     return log_dir
 
 
+@pytest.fixture(scope="session")
+def goth_config_loader() -> ConfigLoader:
+    """Fixture providing a memoized wrapper around `load_yaml`.
+
+    Parsing a goth-config.yml file and applying overrides is repeated by
+    every test, so the resulting `Configuration` is cached per
+    (config path, overrides) pair for the whole test session.
+    """
+    cache: Dict[Tuple[str, str], Configuration] = {}
+
+    def load(config_path: Path, overrides: List[Override]) -> Configuration:
+        key = (str(config_path), repr(overrides))
+        if key not in cache:
+            cache[key] = load_yaml(config_path, overrides)
+        return cache[key]
+
+    return load
+
+
 @pytest.fixture(scope="function")
 def config_overrides(request) -> List[Override]:
     """Fixture parsing --config-override params passed to the test invocation."""
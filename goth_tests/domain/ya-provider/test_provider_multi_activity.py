@@ -1,14 +1,15 @@
 """End to end tests for requesting WASM tasks using goth REST API clients."""
+import asyncio
 import json
 import logging
 import re
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, List, Tuple
 
 import pytest
 from ya_activity.exceptions import ApiException
 
-from goth.configuration import load_yaml, Override, Configuration
+from goth.configuration import Override, Configuration
 from goth.runner import Runner
 from goth.runner.probe import RequestorProbe
 
@@ -18,17 +19,28 @@ from goth_tests.helpers.activity import (
     wasi_task_package,
     wasi_sleeper_task_package,
 )
+from goth_tests.helpers.concurrency import gather_all
 from goth_tests.helpers.negotiation import negotiate_agreements, DemandBuilder
 from goth_tests.helpers.payment import pay_all
 from goth_tests.helpers.probe import ProviderProbe
 
 logger = logging.getLogger("goth.test.multi-activity")
 
+_SINGLE_ACTIVITY_RE = re.compile(
+    r"terminated\. Reason: Only single Activity allowed,"
+    r" message: Can't create 2 simultaneous Activities\."
+)
+
 
 def _create_runner(
-    common_assets: Path, config_overrides: List[Override], log_dir: Path
+    common_assets: Path,
+    config_overrides: List[Override],
+    log_dir: Path,
+    load_config: Callable[[Path, List[Override]], Configuration],
 ) -> Tuple[Runner, Configuration]:
-    goth_config = load_yaml(Path(__file__).parent / "goth-config.yml", config_overrides)
+    goth_config = load_config(
+        Path(__file__).parent / "goth-config.yml", config_overrides
+    )
 
     runner = Runner(
         base_log_dir=log_dir,
@@ -38,18 +50,57 @@ def _create_runner(
     return runner, goth_config
 
 
+def _build_demand(requestor: RequestorProbe, task_package: str):
+    """Build the multi-activity wasmtime Demand shared by tests in this module."""
+    return (
+        DemandBuilder(requestor)
+        .props_from_template(task_package)
+        .property("golem.srv.caps.multi-activity", True)
+        .constraints(
+            "(&(golem.com.pricing.model=linear)\
+            (golem.srv.caps.multi-activity=true)\
+            (golem.runtime.name=wasmtime))"
+        )
+        .build()
+    )
+
+
+async def _run_one_activity(
+    requestor: RequestorProbe,
+    provider: ProviderProbe,
+    agreement_id: str,
+    exe_script_json: str,
+    exe_script_len: int,
+):
+    """Run a single Activity from creation to destruction."""
+    activity_id = await requestor.create_activity(agreement_id)
+    logger.info("Activity %s created on %s", activity_id, provider.name)
+    await provider.wait_for_exeunit_started()
+    batch_id = await requestor.call_exec(activity_id, exe_script_json)
+    await requestor.collect_results(activity_id, batch_id, exe_script_len, timeout=30)
+    # All results are already in, so the destroy round-trip can overlap with
+    # the provider-side exeunit-finished log wait it triggers.
+    await gather_all(
+        requestor.destroy_activity(activity_id),
+        provider.wait_for_exeunit_finished(),
+    )
+
+
 @pytest.mark.asyncio
 async def test_provider_multi_activity(
     common_assets: Path,
     config_overrides: List[Override],
     log_dir: Path,
+    goth_config_loader: Callable[[Path, List[Override]], Configuration],
 ):
     """Test provider handling multiple activities in single Agreement.
 
     Tests running multiple activities on single Provider.
     In this case Requestor is responsible for terminating Agreement.
     """
-    runner, config = _create_runner(common_assets, config_overrides, log_dir)
+    runner, config = _create_runner(
+        common_assets, config_overrides, log_dir, goth_config_loader
+    )
 
     async with runner(config.containers):
         requestor = runner.get_probes(probe_type=RequestorProbe)[0]
@@ -61,17 +112,7 @@ async def test_provider_multi_activity(
             web_server_addr=runner.host_address, web_server_port=runner.web_server_port
         )
 
-        demand = (
-            DemandBuilder(requestor)
-            .props_from_template(task_package)
-            .property("golem.srv.caps.multi-activity", True)
-            .constraints(
-                "(&(golem.com.pricing.model=linear)\
-                (golem.srv.caps.multi-activity=true)\
-                (golem.runtime.name=wasmtime))"
-            )
-            .build()
-        )
+        demand = _build_demand(requestor, task_package)
 
         agreement_providers = await negotiate_agreements(
             requestor,
@@ -81,24 +122,31 @@ async def test_provider_multi_activity(
 
         #  Activity
         exe_script = wasi_exe_script(runner)
-
-        for agreement_id, provider in agreement_providers:
+        # The exe script is constant across activities, so serialize it once.
+        exe_script_json = json.dumps(exe_script)
+        exe_script_len = len(exe_script)
+
+        async def _process_agreement(agreement_id: str, provider: ProviderProbe):
+            # The provider allows only one Activity at a time (multi-activity
+            # means many activities per Agreement, not simultaneously), so the
+            # three activities must run sequentially; only the per-agreement
+            # processing across providers runs concurrently.
             for i in range(0, 3):
                 logger.info("Running activity %d-th time on %s", i, provider.name)
-                activity_id = await requestor.create_activity(agreement_id)
-                await provider.wait_for_exeunit_started()
-                batch_id = await requestor.call_exec(
-                    activity_id, json.dumps(exe_script)
-                )
-                await requestor.collect_results(
-                    activity_id, batch_id, len(exe_script), timeout=30
+                await _run_one_activity(
+                    requestor, provider, agreement_id, exe_script_json, exe_script_len
                 )
-                await requestor.destroy_activity(activity_id)
-                await provider.wait_for_exeunit_finished()
 
             await requestor.terminate_agreement(agreement_id, None)
             await provider.wait_for_agreement_terminated()
 
+        await gather_all(
+            *(
+                _process_agreement(agreement_id, provider)
+                for agreement_id, provider in agreement_providers
+            )
+        )
+
         # Payment
         await pay_all(requestor, agreement_providers)
 
@@ -108,12 +156,15 @@ async def test_provider_single_simultaneous_activity(
     common_assets: Path,
     config_overrides: List[Override],
     log_dir: Path,
+    goth_config_loader: Callable[[Path, List[Override]], Configuration],
 ):
     """Test provider rejecting second activity if one is already running.
 
     Provider is expected to reject second activity, if one is already running.
     """
-    runner, config = _create_runner(common_assets, config_overrides, log_dir)
+    runner, config = _create_runner(
+        common_assets, config_overrides, log_dir, goth_config_loader
+    )
 
     async with runner(config.containers):
         requestor = runner.get_probes(probe_type=RequestorProbe)[0]
@@ -125,17 +176,7 @@ async def test_provider_single_simultaneous_activity(
             web_server_addr=runner.host_address, web_server_port=runner.web_server_port
         )
 
-        demand = (
-            DemandBuilder(requestor)
-            .props_from_template(task_package)
-            .property("golem.srv.caps.multi-activity", True)
-            .constraints(
-                "(&(golem.com.pricing.model=linear)\
-                (golem.srv.caps.multi-activity=true)\
-                (golem.runtime.name=wasmtime))"
-            )
-            .build()
-        )
+        demand = _build_demand(requestor, task_package)
 
         agreement_providers = await negotiate_agreements(
             requestor,
@@ -152,11 +193,7 @@ async def test_provider_single_simultaneous_activity(
         with pytest.raises(ApiException) as e:
             await requestor.create_activity(agreement_id)
 
-        assert re.search(
-            r"terminated. Reason: Only single Activity allowed,"
-            r" message: Can't create 2 simultaneous Activities.",
-            e.value.body,
-        )
+        assert _SINGLE_ACTIVITY_RE.search(e.value.body)
 
         await requestor.destroy_activity(first_activity_id)
         await provider.wait_for_exeunit_finished()
@@ -170,6 +207,7 @@ async def test_provider_recover_from_abandoned_task(
     common_assets: Path,
     config_overrides: List[Override],
     log_dir: Path,
+    goth_config_loader: Callable[[Path, List[Override]], Configuration],
 ):
     """Tests providers' ability of terminating an abandoned task
     and starting another one"""
@@ -181,7 +219,9 @@ async def test_provider_recover_from_abandoned_task(
     ]
 
     config_overrides.append(("nodes", nodes))
-    runner, config = _create_runner(common_assets, config_overrides, log_dir)
+    runner, config = _create_runner(
+        common_assets, config_overrides, log_dir, goth_config_loader
+    )
 
     async with runner(config.containers):
         requestors = runner.get_probes(probe_type=RequestorProbe)
@@ -273,6 +313,7 @@ async def test_provider_renegotiate_proposal(
     common_assets: Path,
     config_overrides: List[Override],
     log_dir: Path,
+    goth_config_loader: Callable[[Path, List[Override]], Configuration],
 ):
     """Tests providers' ability of renegotiating previously rejected proposal."""
 
@@ -283,33 +324,23 @@ async def test_provider_renegotiate_proposal(
     ]
     config_overrides.append(("nodes", nodes))
 
-    runner, config = _create_runner(common_assets, config_overrides, log_dir)
+    runner, config = _create_runner(
+        common_assets, config_overrides, log_dir, goth_config_loader
+    )
 
     async with runner(config.containers):
         requestor1, requestor2 = runner.get_probes(probe_type=RequestorProbe)
         providers = runner.get_probes(probe_type=ProviderProbe)
         assert providers
 
-        def build_demand(requestor):
-            return (
-                DemandBuilder(requestor)
-                .props_from_template(wasi_task_package)
-                .property("golem.srv.caps.multi-activity", True)
-                .constraints(
-                    "(&(golem.com.pricing.model=linear)\
-                    (golem.srv.caps.multi-activity=true)\
-                    (golem.runtime.name=wasmtime))"
-                )
-                .build()
-            )
-
         async def negotiate_begin(requestor, demand, providers):
             logger.info(
                 "%s Negotiating with providers",
                 requestor.name,
             )
-            for provider in providers:
-                await provider.wait_for_offer_subscribed()
+            await gather_all(
+                *(provider.wait_for_offer_subscribed() for provider in providers)
+            )
 
             subscription_id, demand = await requestor.subscribe_demand(demand)
 
@@ -325,9 +356,10 @@ async def test_provider_renegotiate_proposal(
         async def accept_all_proposals(
             requestor, demand, providers, subscription_id, proposals
         ):
-            counter_providers = []
-            for proposal in proposals:
-                provider = next(p for p in providers if p.address == proposal.issuer_id)
+            providers_by_address = {p.address: p for p in providers}
+
+            async def _counter_one(proposal):
+                provider = providers_by_address[proposal.issuer_id]
                 logger.info(
                     "%s Processing proposal from %s", requestor.name, provider.name
                 )
@@ -335,8 +367,9 @@ async def test_provider_renegotiate_proposal(
                 counter_proposal_id = await requestor.counter_proposal(
                     subscription_id, demand, proposal
                 )
-                counter_providers.append((counter_proposal_id, provider))
-            return counter_providers
+                return counter_proposal_id, provider
+
+            return await gather_all(*(_counter_one(p) for p in proposals))
 
         async def renegotiate(requestor, providers: List[ProviderProbe], subscription_id):
             logger.info("%s: renegotiate()", requestor.name)
@@ -356,7 +389,8 @@ async def test_provider_renegotiate_proposal(
                 == "No capacity available. Reached Agreements limit: 1"
             )
             offer = events[1].proposal
-            provider = [p for p in providers if p.address == events[1].proposal.issuer_id][0]
+            providers_by_address = {p.address: p for p in providers}
+            provider = providers_by_address[events[1].proposal.issuer_id]
 
             agreement_id = await requestor.create_agreement(offer)
             await requestor.confirm_agreement(agreement_id)
@@ -369,30 +403,48 @@ async def test_provider_renegotiate_proposal(
             requestor, demand, providers, subscription_id, proposals
         ):
             logger.info("%s: negotiate_finalize()", requestor.name)
-            agreement_providers = []
 
-            for proposal in proposals:
-                provider = next(p for p in providers if p.address == proposal.issuer_id)
+            providers_by_address = {p.address: p for p in providers}
+            matched_providers = [
+                providers_by_address[proposal.issuer_id] for proposal in proposals
+            ]
+            for provider in matched_providers:
                 logger.info(
                     "%s Processing proposal from %s", requestor.name, provider.name
                 )
 
-                counter_proposal_id = await requestor.counter_proposal(
-                    subscription_id, demand, proposal
+            # Phase 1: submit all counter-proposals, then wait for the
+            # providers to accept them.
+            counter_ids = await gather_all(
+                *(
+                    requestor.counter_proposal(subscription_id, demand, proposal)
+                    for proposal in proposals
                 )
-                await provider.wait_for_proposal_accepted()
+            )
+            await gather_all(
+                *(p.wait_for_proposal_accepted() for p in matched_providers)
+            )
 
-                new_proposals = await requestor.wait_for_proposals(
-                    subscription_id,
-                    (provider,),
-                    lambda proposal: proposal.prev_proposal_id == counter_proposal_id,
-                )
+            # Phase 2: collect all follow-up proposals in one pass and
+            # finalize the agreements concurrently.
+            counter_id_set = set(counter_ids)
+            new_proposals = await requestor.wait_for_proposals(
+                subscription_id,
+                providers,
+                lambda proposal: proposal.prev_proposal_id in counter_id_set,
+            )
 
-                agreement_id = await requestor.create_agreement(new_proposals[0])
+            async def _finalize_agreement(proposal):
+                provider = providers_by_address[proposal.issuer_id]
+                agreement_id = await requestor.create_agreement(proposal)
                 await requestor.confirm_agreement(agreement_id)
                 await provider.wait_for_agreement_approved()
                 await requestor.wait_for_approval(agreement_id)
-                agreement_providers.append((agreement_id, provider))
+                return agreement_id, provider
+
+            agreement_providers = await gather_all(
+                *(_finalize_agreement(proposal) for proposal in new_proposals)
+            )
 
             await requestor.unsubscribe_demand(subscription_id)
             logger.info("Got %d agreements", len(agreement_providers))
@@ -411,22 +463,29 @@ async def test_provider_renegotiate_proposal(
                 activity_id = await requestor.create_activity(agreement_id)
                 await provider.wait_for_exeunit_started()
                 await requestor.destroy_activity(activity_id)
-                await provider.wait_for_exeunit_finished()
-
+                # The activity is already destroyed on the requestor side, so
+                # the exeunit-finished log wait can overlap with terminating
+                # the agreement.
+                exeunit_finished = asyncio.create_task(
+                    provider.wait_for_exeunit_finished()
+                )
                 await requestor.terminate_agreement(agreement_id, None)
+                await exeunit_finished
                 await provider.wait_for_agreement_terminated()
 
             # Payment
             await pay_all(requestor, agreement_providers)
             logger.info("%s run() -> done", requestor.name)
 
-        demand1 = build_demand(requestor1)
-        demand2 = build_demand(requestor2)
-        subscription_id1, proposals1 = await negotiate_begin(
-            requestor1, demand1, providers
-        )
-        subscription_id2, proposals2 = await negotiate_begin(
-            requestor2, demand2, providers
+        demand1 = _build_demand(requestor1, wasi_task_package)
+        demand2 = _build_demand(requestor2, wasi_task_package)
+        # The two negotiations are independent at this stage, so their
+        # proposal-collection windows can overlap.
+        (subscription_id1, proposals1), (subscription_id2, proposals2) = (
+            await gather_all(
+                negotiate_begin(requestor1, demand1, providers),
+                negotiate_begin(requestor2, demand2, providers),
+            )
         )
         agreement_providers1 = await negotiate_finalize(
             requestor1, demand1, providers, subscription_id1, proposals1
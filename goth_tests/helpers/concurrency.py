@@ -0,0 +1,25 @@
+"""Helpers for running independent coroutines concurrently."""
+
+import asyncio
+import sys
+
+
+if sys.version_info >= (3, 11):
+
+    async def gather_all(*aws):
+        """Run awaitables concurrently with structured cancellation.
+
+        Uses `asyncio.TaskGroup`, so when one awaitable fails its siblings
+        are cancelled instead of continuing to issue API calls against a
+        test network that is already failing. Results are returned in the
+        order the awaitables were passed, like `asyncio.gather`.
+        """
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(aw) for aw in aws]
+        return [task.result() for task in tasks]
+
+else:
+
+    async def gather_all(*aws):
+        """Run awaitables concurrently (`asyncio.gather` fallback for Python < 3.11)."""
+        return await asyncio.gather(*aws)
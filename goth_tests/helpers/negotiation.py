@@ -9,6 +9,8 @@ from ya_market import Demand, DemandOfferBase, Proposal
 from goth.node import DEFAULT_SUBNET
 from goth.runner.probe import ProviderProbe, RequestorProbe
 
+from goth_tests.helpers.concurrency import gather_all
+
 
 logger = logging.getLogger("goth.tests.helpers.negotiation")
 
@@ -81,8 +83,9 @@ async def negotiate_agreements(
     and need ready Agreements.
     """
     if wait_for_offers_subscribed:
-        for provider in providers:
-            await provider.wait_for_offer_subscribed()
+        await gather_all(
+            *(provider.wait_for_offer_subscribed() for provider in providers)
+        )
 
     subscription_id, demand = await requestor.subscribe_demand(demand)
 
@@ -94,9 +97,10 @@ async def negotiate_agreements(
     logger.info("Collected %s proposals", len(proposals))
 
     agreement_providers = []
+    providers_by_address = {p.address: p for p in providers}
 
     for proposal in proposals:
-        provider = next(p for p in providers if p.address == proposal.issuer_id)
+        provider = providers_by_address[proposal.issuer_id]
         new_proposal = proposal
         exchanges = 0
 
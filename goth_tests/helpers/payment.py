@@ -10,6 +10,8 @@ from typing import List, Optional, Tuple, Dict, Union
 from goth.runner.probe import ProviderProbe, RequestorProbe
 from goth.runner.probe.rest_client import ya_payment
 
+from goth_tests.helpers.concurrency import gather_all
+
 
 logger = logging.getLogger("goth.tests.helpers.payment")
 
@@ -19,7 +21,8 @@ async def pay_all(
     agreements: List[Tuple[str, ProviderProbe]],
 ):
     """Pay for all Agreements."""
-    for agreement_id, provider in agreements:
+
+    async def _pay_agreement(agreement_id: str, provider: ProviderProbe):
         await provider.wait_for_invoice_sent()
         invoices = await requestor.gather_invoices(agreement_id)
         assert all(inv.agreement_id == agreement_id for inv in invoices)
@@ -27,6 +30,14 @@ async def pay_all(
         await requestor.pay_invoices(invoices)
         await provider.wait_for_invoice_paid()
 
+    # Agreements are independent, so invoice waits and payments can overlap.
+    await gather_all(
+        *(
+            _pay_agreement(agreement_id, provider)
+            for agreement_id, provider in agreements
+        )
+    )
+
 
 async def accept_debit_notes(
     requestor: RequestorProbe,